@@ -5,7 +5,10 @@ Generates all anchor modeling entities (anchors, ties, attributes, knots)
 from model.xml (structure) and sources.yaml (source mappings).
 """
 
+import functools
+import string
 import xml.etree.ElementTree as ET
+from collections import Counter
 from pathlib import Path
 from typing import Any
 
@@ -26,9 +29,12 @@ _CONFIG_PATH = Path(__file__).parent / "config.yaml"
 MODEL_XML = Path(__file__).parent / "model.xml"
 SOURCES_YAML = Path(__file__).parent / "sources.yaml"
 
+# Prefer libyaml's C loader; fall back to the pure-Python loader if PyYAML was built without it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Load configuration
-with open(_CONFIG_PATH) as f:
-    _config = yaml.safe_load(f)
+with open(_CONFIG_PATH, "rb") as f:
+    _config = yaml.load(f, Loader=_YamlLoader)
 
 TARGET_DATABASE = _config["target_database"]
 TARGET_SCHEMA = _config["target_schema"]
@@ -39,7 +45,12 @@ OUTPUT_CASE_STYLE = _config["output_case_style"]
 # Column Name Conversion
 # ---------------------------------------------------------------------------
 
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER_OR_DIGIT = frozenset(string.ascii_lowercase + string.digits)
+
 
+# Column names repeat across every source of an entity, so each distinct name is converted once
+@functools.lru_cache(maxsize=4096)
 def _camel_to_snake(name: str) -> str:
     """
     Convert camelCase to snake_case with special handling for underscores.
@@ -53,22 +64,19 @@ def _camel_to_snake(name: str) -> str:
         bool_isCamelCase -> bool__is_camel_case
         EM_reports -> em__reports
     """
-    import re
-
-    # First, identify any existing underscores and mark them for doubling
-    # Replace _ with a placeholder that won't conflict
-    name = name.replace('_', '___UNDERSCORE___')
-
-    # Insert underscores before uppercase letters
-    name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', name)
-
-    # Convert to lowercase
-    name = name.lower()
-
-    # Replace the placeholder with double underscores
-    name = name.replace('___underscore___', '__')
-
-    return name
+    # One scan: a capital after a lowercase letter or digit starts a new word, and existing
+    # underscores are doubled in place. Lowercasing happens once on the joined result.
+    chars = []
+    prev = ""
+    for ch in name:
+        if ch == "_":
+            chars.append("__")
+        else:
+            if ch in _UPPER and prev in _LOWER_OR_DIGIT:
+                chars.append("_")
+            chars.append(ch)
+        prev = ch
+    return "".join(chars).lower()
 
 
 def _format_column_name(name: str) -> str:
@@ -98,96 +106,110 @@ def _parse_xml_structure(xml_path: Path) -> dict[str, Any]:
     Parse model.xml for anchor model structure.
     Returns: {anchors: {...}, ties: {...}, attributes: {...}, knots: {...}}
     """
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
     model_structure = {"anchors": {}, "ties": {}, "attributes": {}, "knots": {}}
 
-    # Parse anchors with their nested attributes
-    for anchor_elem in root.findall("anchor"):
-        mnemonic = anchor_elem.get("mnemonic")
-        descriptor = anchor_elem.get("descriptor")
-        model_structure["anchors"][mnemonic] = {
-            "mnemonic": mnemonic,
-            "descriptor": descriptor,
-        }
+    # Stream the file: each top-level <anchor>, <tie> and <knot> is handled once its end tag
+    # (and so all of its children) has been read, then cleared to keep memory flat.
+    for _, elem in ET.iterparse(xml_path, events=("end",)):
+        if elem.tag == "anchor":
+            _parse_anchor_element(elem, model_structure)
+        elif elem.tag == "tie":
+            _parse_tie_element(elem, model_structure)
+        elif elem.tag == "knot":
+            _parse_knot_element(elem, model_structure)
+        else:
+            continue
+        elem.clear()
 
-        # Parse attributes for this anchor
-        for attr_elem in anchor_elem.findall("attribute"):
-            attr_mnemonic = attr_elem.get("mnemonic")
-            attr_descriptor = attr_elem.get("descriptor")
-            attr_name = f"{mnemonic}_{attr_mnemonic}"
-
-            # Determine if historized (has timeRange) or static
-            is_historized = attr_elem.get("timeRange") is not None
-
-            # Determine if knotted (has knotRange) or regular (has dataRange)
-            knot_range = attr_elem.get("knotRange")
-            data_range = attr_elem.get("dataRange")
-
-            model_structure["attributes"][attr_name] = {
-                "name": attr_name,
-                "anchor_mnemonic": mnemonic,
-                "anchor_descriptor": descriptor,
-                "mnemonic": attr_mnemonic,
-                "descriptor": attr_descriptor,
-                "is_historized": is_historized,
-                "is_knotted": knot_range is not None,
-                "knot_range": knot_range,
-                "data_range": data_range,
-            }
-
-    # Parse ties
-    for tie_elem in root.findall("tie"):
-        roles = []
-        for role_elem in tie_elem.findall("anchorRole"):
-            roles.append({
-                "type": role_elem.get("type"),
-                "role": role_elem.get("role"),
-                "identifier": role_elem.get("identifier") == "true",
-            })
-
-        # Build tie name from roles
-        tie_name = _build_tie_name(roles)
+    return model_structure
+
+
+def _parse_anchor_element(anchor_elem: ET.Element, model_structure: dict[str, Any]) -> None:
+    """Add an <anchor> and its nested attributes to the model structure."""
+    mnemonic = anchor_elem.get("mnemonic")
+    descriptor = anchor_elem.get("descriptor")
+    model_structure["anchors"][mnemonic] = {
+        "mnemonic": mnemonic,
+        "descriptor": descriptor,
+    }
+
+    # Parse attributes for this anchor
+    for attr_elem in anchor_elem.iterfind("attribute"):
+        attr_mnemonic = attr_elem.get("mnemonic")
+        attr_descriptor = attr_elem.get("descriptor")
+        attr_name = f"{mnemonic}_{attr_mnemonic}"
 
         # Determine if historized (has timeRange) or static
-        is_historized = tie_elem.get("timeRange") is not None
+        is_historized = attr_elem.get("timeRange") is not None
 
-        model_structure["ties"][tie_name] = {
-            "roles": roles,
+        # Determine if knotted (has knotRange) or regular (has dataRange)
+        knot_range = attr_elem.get("knotRange")
+        data_range = attr_elem.get("dataRange")
+
+        model_structure["attributes"][attr_name] = {
+            "name": attr_name,
+            "anchor_mnemonic": mnemonic,
+            "anchor_descriptor": descriptor,
+            "mnemonic": attr_mnemonic,
+            "descriptor": attr_descriptor,
             "is_historized": is_historized,
+            "is_knotted": knot_range is not None,
+            "knot_range": knot_range,
+            "data_range": data_range,
         }
 
-    # Parse knots
-    for knot_elem in root.findall("knot"):
-        mnemonic = knot_elem.get("mnemonic")
-        descriptor = knot_elem.get("descriptor")
-        data_range = knot_elem.get("dataRange")
 
-        model_structure["knots"][mnemonic] = {
-            "mnemonic": mnemonic,
-            "descriptor": descriptor,
-            "data_range": data_range,
-        }
+def _parse_tie_element(tie_elem: ET.Element, model_structure: dict[str, Any]) -> None:
+    """Add a <tie> and its anchor roles to the model structure."""
+    roles = []
+    for role_elem in tie_elem.iterfind("anchorRole"):
+        roles.append({
+            "type": role_elem.get("type"),
+            "role": role_elem.get("role"),
+            "identifier": role_elem.get("identifier") == "true",
+        })
 
-    return model_structure
+    # Build tie name from roles
+    tie_name = _build_tie_name(roles)
+
+    # Determine if historized (has timeRange) or static
+    is_historized = tie_elem.get("timeRange") is not None
+
+    model_structure["ties"][tie_name] = {
+        "roles": roles,
+        "is_historized": is_historized,
+        "unique_key": _build_tie_unique_keys(roles),
+    }
+
+
+def _parse_knot_element(knot_elem: ET.Element, model_structure: dict[str, Any]) -> None:
+    """Add a <knot> to the model structure."""
+    mnemonic = knot_elem.get("mnemonic")
+    descriptor = knot_elem.get("descriptor")
+    data_range = knot_elem.get("dataRange")
+
+    model_structure["knots"][mnemonic] = {
+        "mnemonic": mnemonic,
+        "descriptor": descriptor,
+        "data_range": data_range,
+    }
 
 
 def _build_tie_name(roles: list[dict[str, Any]]) -> str:
     """Build canonical tie name from roles."""
-    sorted_roles = sorted(roles, key=lambda r: (not r.get("identifier", False), r["type"]))
-    parts = []
-    for r in sorted_roles:
-        parts.extend([r["type"], r["role"]])
-    return "_".join(parts)
+    # Decorate once and sort plain tuples: identifier roles first, then by anchor type. The
+    # position breaks ties so roles on the same anchor keep their XML order.
+    keyed = sorted((not r["identifier"], r["type"], i, r["role"]) for i, r in enumerate(roles))
+    return "_".join(f"{anchor_type}_{role}" for _, anchor_type, _, role in keyed)
 
 
 def _load_sources(sources_path: Path) -> dict[str, Any]:
     """Load source mappings from sources.yaml."""
     if not sources_path.exists():
         return {"anchors": {}, "ties": {}, "attributes": {}, "knots": {}}
-    with open(sources_path) as f:
-        return yaml.safe_load(f) or {"anchors": {}, "ties": {}, "attributes": {}, "knots": {}}
+    # Read bytes so libyaml decodes UTF-8 natively instead of Python decoding first
+    with open(sources_path, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {"anchors": {}, "ties": {}, "attributes": {}, "knots": {}}
 
 
 def _load_model(
@@ -213,9 +235,55 @@ def _load_model(
     for mnemonic, knot_data in structure["knots"].items():
         knot_data["sources"] = sources.get("knots", {}).get(mnemonic, [])
 
+    # Resolve each tie role's anchor descriptor once, so query building needs no lookup table
+    anchors = structure["anchors"]
+    for tie_name, tie_data in structure["ties"].items():
+        for role in tie_data["roles"]:
+            anchor = anchors.get(role["type"])
+            if anchor is None:
+                raise ModelValidationError(
+                    f"Tie {tie_name}: role {role['role']} references unknown anchor {role['type']}"
+                )
+            role["descriptor"] = anchor["descriptor"]
+
+    # Descriptor lookup used by knotted-attribute blueprints, cached with the model
+    structure["knot_descriptors"] = {mnemonic: k["descriptor"] for mnemonic, k in structure["knots"].items()}
+
     return structure
 
 
+def _mtime_ns(path: Path) -> int | None:
+    """Return the file's modification time in nanoseconds, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# Bounded: every edit to either file adds a new key, and a long-lived process such as the
+# SQLMesh language server would otherwise keep every stale model alive.
+@functools.lru_cache(maxsize=8)
+def _load_model_for_mtimes(
+    xml_path: Path,
+    xml_mtime_ns: int | None,
+    sources_path: Path,
+    sources_mtime_ns: int | None,
+) -> dict[str, Any]:
+    """
+    Memoized _load_model; the mtimes are only part of the cache key.
+
+    Every call with the same key returns the same dict, so it must not be mutated.
+    """
+    return _load_model(xml_path, sources_path)
+
+
+# Fields every source entry must provide, per entity kind
+_ANCHOR_REQUIRED_FIELDS = frozenset({"system", "table", "key"})
+_TIE_REQUIRED_FIELDS = frozenset({"system", "table", "keys"})
+_ATTRIBUTE_REQUIRED_FIELDS = frozenset({"system", "table", "key", "value"})
+_KNOT_REQUIRED_FIELDS = frozenset({"system", "table", "value"})
+
+
 def _generate_anchor_stub(mnemonic: str, descriptor: str) -> str:
     """Generate YAML stub for a missing anchor source."""
     return f"""  {mnemonic}:  # {descriptor}
@@ -227,9 +295,7 @@ def _generate_anchor_stub(mnemonic: str, descriptor: str) -> str:
 def _generate_tie_stub(tie_name: str, roles: list[dict[str, Any]]) -> str:
     """Generate YAML stub for a missing tie source."""
     # Build keys section with role-specific or anchor-type keys
-    anchor_counts: dict[str, int] = {}
-    for r in roles:
-        anchor_counts[r["type"]] = anchor_counts.get(r["type"], 0) + 1
+    anchor_counts = Counter(r["type"] for r in roles)
 
     keys_lines = []
     for r in roles:
@@ -252,7 +318,6 @@ def _generate_tie_stub(tie_name: str, roles: list[dict[str, Any]]) -> str:
 
 def _validate_anchor_sources(model_data: dict[str, Any]) -> list[str]:
     """Validate anchor sources and return list of error stubs."""
-    required_fields = {"system", "table", "key"}
     stubs = []
 
     for mnemonic, config in model_data.get("anchors", {}).items():
@@ -264,8 +329,9 @@ def _validate_anchor_sources(model_data: dict[str, Any]) -> list[str]:
             continue
 
         for i, src in enumerate(sources):
-            missing = required_fields - set(src.keys())
-            if missing:
+            # Subset test on the common valid path; the difference is only built for the error
+            if not _ANCHOR_REQUIRED_FIELDS.issubset(src):
+                missing = _ANCHOR_REQUIRED_FIELDS - src.keys()
                 stubs.append(
                     f"# Anchor {mnemonic} source[{i}] missing fields: {sorted(missing)}\n"
                     + _generate_anchor_stub(mnemonic, descriptor)
@@ -287,14 +353,11 @@ def _validate_tie_sources(model_data: dict[str, Any]) -> list[str]:
             continue
 
         for i, src in enumerate(sources):
-            missing_fields = []
-            for field in ("system", "table", "keys"):
-                if field not in src:
-                    missing_fields.append(field)
-
-            if missing_fields:
+            if not _TIE_REQUIRED_FIELDS.issubset(src):
+                # Tie messages list missing fields in declared order
+                missing = [field for field in ("system", "table", "keys") if field not in src]
                 stubs.append(
-                    f"# Tie {tie_name} source[{i}] missing fields: {missing_fields}\n"
+                    f"# Tie {tie_name} source[{i}] missing fields: {missing}\n"
                     + _generate_tie_stub(tie_name, roles)
                 )
 
@@ -313,7 +376,6 @@ def _generate_attribute_stub(attr_name: str, descriptor: str, anchor_mnemonic: s
 
 def _validate_attribute_sources(model_data: dict[str, Any]) -> list[str]:
     """Validate attribute sources and return list of error stubs."""
-    required_fields = {"system", "table", "key", "value"}
     stubs = []
 
     for attr_name, config in model_data.get("attributes", {}).items():
@@ -327,8 +389,8 @@ def _validate_attribute_sources(model_data: dict[str, Any]) -> list[str]:
             continue
 
         for i, src in enumerate(sources):
-            missing = required_fields - set(src.keys())
-            if missing:
+            if not _ATTRIBUTE_REQUIRED_FIELDS.issubset(src):
+                missing = _ATTRIBUTE_REQUIRED_FIELDS - src.keys()
                 stubs.append(
                     f"# Attribute {attr_name} source[{i}] missing fields: {sorted(missing)}\n"
                     + _generate_attribute_stub(attr_name, descriptor, anchor_mnemonic, anchor_descriptor)
@@ -347,7 +409,6 @@ def _generate_knot_stub(mnemonic: str, descriptor: str) -> str:
 
 def _validate_knot_sources(model_data: dict[str, Any]) -> list[str]:
     """Validate knot sources and return list of error stubs."""
-    required_fields = {"system", "table", "value"}
     stubs = []
 
     for mnemonic, config in model_data.get("knots", {}).items():
@@ -359,8 +420,8 @@ def _validate_knot_sources(model_data: dict[str, Any]) -> list[str]:
             continue
 
         for i, src in enumerate(sources):
-            missing = required_fields - set(src.keys())
-            if missing:
+            if not _KNOT_REQUIRED_FIELDS.issubset(src):
+                missing = _KNOT_REQUIRED_FIELDS - src.keys()
                 stubs.append(
                     f"# Knot {mnemonic} source[{i}] missing fields: {sorted(missing)}\n"
                     + _generate_knot_stub(mnemonic, descriptor)
@@ -406,44 +467,121 @@ def _validate_model(model_data: dict[str, Any]) -> None:
         raise ModelValidationError("\n".join(error_msg))
 
 
+@functools.lru_cache(maxsize=8)
+def _validated_model_for_mtimes(
+    xml_path: Path,
+    xml_mtime_ns: int | None,
+    sources_path: Path,
+    sources_mtime_ns: int | None,
+) -> dict[str, Any]:
+    """
+    Memoized load + validate; a failed validation raises and is not cached.
+
+    Returns the cached dict from _load_model_for_mtimes itself, not a copy.
+    """
+    model_data = _load_model_for_mtimes(xml_path, xml_mtime_ns, sources_path, sources_mtime_ns)
+    _validate_model(model_data)
+    return model_data
+
+
+def _validated_model(
+    xml_path: Path = MODEL_XML,
+    sources_path: Path = SOURCES_YAML,
+) -> dict[str, Any]:
+    """
+    Load and validate the anchor model, skipping both while neither file has changed.
+
+    The returned dict is shared between callers and must be treated as read-only.
+    """
+    return _validated_model_for_mtimes(xml_path, _mtime_ns(xml_path), sources_path, _mtime_ns(sources_path))
+
+
 # ---------------------------------------------------------------------------
 # SQL Generation Helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
+def _needs_quotes(name: str) -> bool:
+    """Whether an identifier must be quoted; memoized, as the same names recur in every query."""
+    return not exp.SAFE_IDENTIFIER_RE.match(name)
+
+
+def _identifier(name: str) -> exp.Identifier:
+    """Build a fresh Identifier like exp.to_identifier, with the quoting decision cached per name."""
+    return exp.Identifier(this=name, quoted=_needs_quotes(name))
+
+
+def _data_type(name: str) -> exp.DataType:
+    """Return a fresh DataType node for a type name."""
+    return exp.DataType.build(name)
+
+
+def _timestamp_literal(value: str) -> exp.Cast:
+    """Build CAST('<value>' AS TIMESTAMP)."""
+    return exp.Cast(this=exp.Literal.string(value), to=exp.DataType.build("TIMESTAMP"))
+
+
+def _alias(expression: exp.Expression, name: str) -> exp.Alias:
+    """Build `expression AS name` directly, skipping the parse/copy done by Expression.as_."""
+    return exp.Alias(this=expression, alias=_identifier(name))
+
+
+def _select_from(columns: list[exp.Expression], table: str, distinct: bool = False) -> exp.Select:
+    """Build `SELECT columns FROM table` directly; to_table parses just the name, not a FROM clause."""
+    select = exp.Select(expressions=columns, **{"from": exp.From(this=exp.to_table(table))})
+    if distinct:
+        select.set("distinct", exp.Distinct())
+    return select
+
 
 def _build_keyset_expression(
     descriptor: str,
     system: str,
     key: str | list[str],
     tenant: str | None = None,
+    cast_type: str = "VARCHAR",
 ) -> exp.Expression:
     """
     Build keyset ID expression: {descriptor}@{system}[~{tenant}]|{key_values}
+
+    Key columns are cast to cast_type; knot IDs pass "TEXT", since knot values can be long.
     """
     prefix = f"{descriptor}@{system}~{tenant}|" if tenant else f"{descriptor}@{system}|"
-    keys = [key] if isinstance(key, str) else key
+    data_type = exp.DataType.build(cast_type)
+
+    # Single-column keys are the common case: no separators to interleave
+    if isinstance(key, str):
+        return exp.Concat(
+            expressions=[
+                exp.Literal.string(prefix),
+                exp.Cast(this=exp.Column(this=_identifier(key)), to=data_type),
+            ]
+        )
 
     parts: list[exp.Expression] = [exp.Literal.string(prefix)]
-    for i, k in enumerate(keys):
+    for i, k in enumerate(key):
         if i > 0:
             parts.append(exp.Literal.string("|"))
-        parts.append(exp.Cast(this=exp.Column(this=exp.to_identifier(k)), to=exp.DataType.build("VARCHAR")))
+        parts.append(exp.Cast(this=exp.Column(this=_identifier(k)), to=data_type.copy()))
 
-    result = parts[0]
-    for part in parts[1:]:
-        result = exp.Concat(expressions=[result, part])
-    return result
+    # One n-ary CONCAT rather than a nested chain of binary ones
+    return exp.Concat(expressions=parts)
 
 
 def _union_all(selects: list[exp.Select]) -> exp.Expression:
     """Combine multiple SELECTs with UNION ALL."""
-    if len(selects) == 1:
-        return selects[0]
-
-    result = selects[0]
-    for select in selects[1:]:
-        result = exp.Union(this=result, expression=select, distinct=False)
-    return result
+    # Pair adjacent operands into a balanced tree: depth is log2(N) rather than N, which
+    # keeps sqlglot's recursive traversal shallow. The generated SQL is the same flat chain.
+    queries: list[exp.Expression] = list(selects)
+    while len(queries) > 1:
+        paired = [
+            exp.Union(this=left, expression=right, distinct=False)
+            for left, right in zip(queries[0::2], queries[1::2])
+        ]
+        if len(queries) % 2:
+            paired.append(queries[-1])
+        queries = paired
+    return queries[0]
 
 
 def _build_incremental_query(
@@ -461,27 +599,30 @@ def _build_incremental_query(
              source AS (source_query)
         SELECT columns FROM source ANTI JOIN target ON keys
     """
-    key_columns = [exp.Column(this=exp.to_identifier(k)) for k in unique_keys]
-
+    # Nodes are constructed directly rather than through the select()/from_()/join()/with_()
+    # builders, which copy their receiver on every chained call. Each position gets its own
+    # Column nodes because sqlglot tracks a single parent per node. The arg dicts are
+    # unpacked since "from" and "with" are Python keywords.
     window = exp.Window(
         this=exp.RowNumber(),
-        partition_by=key_columns,
-        order=exp.Order(expressions=[exp.Ordered(this=exp.Column(this=exp.to_identifier(loaded_at_col)), desc=True)]),
+        partition_by=[exp.Column(this=_identifier(k)) for k in unique_keys],
+        order=exp.Order(expressions=[exp.Ordered(this=exp.Column(this=_identifier(loaded_at_col)), desc=True)]),
     )
 
-    # Build explicit table reference: schema.table_name
-    full_table_name = f"{TARGET_SCHEMA}.{model_name}"
-    target_select = (
-        exp.select(*key_columns)
-        .from_(full_table_name)
-        .qualify(exp.EQ(this=window, expression=exp.Literal.number(1)))
+    # Explicit table reference: schema.table_name
+    target_select = exp.Select(
+        **{
+            "expressions": [exp.Column(this=_identifier(k)) for k in unique_keys],
+            "from": exp.From(this=exp.table_(model_name, db=TARGET_SCHEMA)),
+            "qualify": exp.Qualify(this=exp.EQ(this=window, expression=exp.Literal.number(1))),
+        }
     )
 
     # Build join condition
     join_conditions = [
         exp.EQ(
-            this=exp.Column(this=exp.to_identifier(k), table=exp.to_identifier("source")),
-            expression=exp.Column(this=exp.to_identifier(k), table=exp.to_identifier("target")),
+            this=exp.Column(this=_identifier(k), table=_identifier("source")),
+            expression=exp.Column(this=_identifier(k), table=_identifier("target")),
         )
         for k in unique_keys
     ]
@@ -491,21 +632,30 @@ def _build_incremental_query(
 
     # Build output columns with explicit types
     outer_columns = [
-        exp.Cast(
-            this=exp.Column(this=exp.to_identifier(col_name), table=exp.to_identifier("source")),
-            to=exp.DataType.build(data_type),
-        ).as_(col_name)
+        exp.Alias(
+            this=exp.Cast(
+                this=exp.Column(this=_identifier(col_name), table=_identifier("source")),
+                to=_data_type(data_type),
+            ),
+            alias=_identifier(col_name),
+        )
         for col_name, data_type in output_columns
     ]
 
-    main_select = (
-        exp.select(*outer_columns)
-        .from_(exp.Table(this=exp.to_identifier("source")))
-        .join(exp.Table(this=exp.to_identifier("target")), on=join_on, join_type="ANTI")
+    return exp.Select(
+        **{
+            "with": exp.With(
+                expressions=[
+                    exp.CTE(this=target_select, alias=exp.TableAlias(this=_identifier("target"))),
+                    exp.CTE(this=source_query, alias=exp.TableAlias(this=_identifier("source"))),
+                ]
+            ),
+            "expressions": outer_columns,
+            "from": exp.From(this=exp.Table(this=_identifier("source"))),
+            "joins": [exp.Join(this=exp.Table(this=_identifier("target")), on=join_on, kind="ANTI")],
+        }
     )
 
-    return main_select.with_("target", as_=target_select).with_("source", as_=source_query)
-
 
 # ---------------------------------------------------------------------------
 # Anchor Query Generation
@@ -525,22 +675,21 @@ def _build_anchor_select(mnemonic: str, descriptor: str, source: dict[str, Any],
 
     # ChangedAt: use source column if provided, otherwise use execution timestamp
     if changed_at_col:
-        changed_at_expr = exp.Column(this=exp.to_identifier(changed_at_col))
+        changed_at_expr = exp.Column(this=_identifier(changed_at_col))
     else:
-        changed_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
+        changed_at_expr = _timestamp_literal(execution_ts)
 
-    loaded_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
+    loaded_at_expr = _timestamp_literal(execution_ts)
 
-    return (
-        exp.select(
-            keyset_expr.as_(f"{mnemonic}_ID"),
-            exp.Literal.string(system).as_(f"{mnemonic}_System"),
-            tenant_expr.as_(f"{mnemonic}_Tenant"),
-            changed_at_expr.as_(f"{mnemonic}_ChangedAt"),
-            loaded_at_expr.as_(f"{mnemonic}_LoadedAt"),
-        )
-        .from_(table)
-    )
+    columns = [
+        _alias(keyset_expr, f"{mnemonic}_ID"),
+        _alias(exp.Literal.string(system), f"{mnemonic}_System"),
+        _alias(tenant_expr, f"{mnemonic}_Tenant"),
+        _alias(changed_at_expr, f"{mnemonic}_ChangedAt"),
+        _alias(loaded_at_expr, f"{mnemonic}_LoadedAt"),
+    ]
+
+    return _select_from(columns, table)
 
 
 def _build_anchor_query(blueprint: dict[str, Any], execution_ts: str, model_name: str) -> exp.Expression:
@@ -583,27 +732,16 @@ def _build_tie_unique_keys(roles: list[dict[str, Any]]) -> list[str]:
     """
     Build unique key column names from tie roles.
 
-    Format: {ANCHOR}_{role}_ID or {ANCHOR}_ID_{role} based on whether anchor appears multiple times.
+    Format: {ANCHOR}_ID_{role}, matching the official Anchor Modeler.
     Example: OH_ID_in, OD_ID_isContained for tie OH_in_OD_isContained
     """
-    anchor_counts: dict[str, int] = {}
-    for r in roles:
-        anchor_counts[r["type"]] = anchor_counts.get(r["type"], 0) + 1
-
-    unique_keys = []
-    for r in roles:
-        anchor_type = r["type"]
-        role_name = r["role"]
-        # Always use format: ANCHOR_ID_role (matching official Anchor Modeler)
-        unique_keys.append(f"{anchor_type}_ID_{role_name}")
-    return unique_keys
+    return [f"{r['type']}_ID_{r['role']}" for r in roles]
 
 
 def _build_tie_select(
     tie_name: str,
     roles: list[dict[str, Any]],
     source: dict[str, Any],
-    anchor_descriptors: dict[str, str],
     execution_ts: str,
 ) -> exp.Select:
     """Build SELECT for one tie source."""
@@ -617,7 +755,7 @@ def _build_tie_select(
     for role in roles:
         anchor_type = role["type"]
         role_name = role["role"]
-        descriptor = anchor_descriptors[anchor_type]
+        descriptor = role["descriptor"]
 
         role_key = f"{anchor_type}_{role_name}"
         if role_key in keys_config:
@@ -630,25 +768,25 @@ def _build_tie_select(
         # Column name: ANCHOR_ID_role (e.g., OH_ID_in)
         col_name = f"{anchor_type}_ID_{role_name}"
         keyset_expr = _build_keyset_expression(descriptor, system, key, tenant)
-        columns.append(keyset_expr.as_(col_name))
+        columns.append(_alias(keyset_expr, col_name))
 
     # Add System, Tenant, ChangedAt, LoadedAt columns with tie name prefix
     tenant_expr = exp.Literal.string(tenant) if tenant else exp.Null()
 
     # ChangedAt: use source column if provided, otherwise use execution timestamp
     if changed_at_col:
-        changed_at_expr = exp.Column(this=exp.to_identifier(changed_at_col))
+        changed_at_expr = exp.Column(this=_identifier(changed_at_col))
     else:
-        changed_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
+        changed_at_expr = _timestamp_literal(execution_ts)
 
-    loaded_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
+    loaded_at_expr = _timestamp_literal(execution_ts)
 
-    columns.append(exp.Literal.string(system).as_(f"{tie_name}_System"))
-    columns.append(tenant_expr.as_(f"{tie_name}_Tenant"))
-    columns.append(changed_at_expr.as_(f"{tie_name}_ChangedAt"))
-    columns.append(loaded_at_expr.as_(f"{tie_name}_LoadedAt"))
+    columns.append(_alias(exp.Literal.string(system), f"{tie_name}_System"))
+    columns.append(_alias(tenant_expr, f"{tie_name}_Tenant"))
+    columns.append(_alias(changed_at_expr, f"{tie_name}_ChangedAt"))
+    columns.append(_alias(loaded_at_expr, f"{tie_name}_LoadedAt"))
 
-    return exp.select(*columns).from_(table)
+    return _select_from(columns, table)
 
 
 def _build_tie_query(blueprint: dict[str, Any], execution_ts: str, model_name: str) -> exp.Expression:
@@ -656,24 +794,26 @@ def _build_tie_query(blueprint: dict[str, Any], execution_ts: str, model_name: s
     tie_name = blueprint["name"]
     roles = blueprint["roles"]
     sources = blueprint["sources"]
-    anchor_descriptors = blueprint["anchor_descriptors"]
 
     if not sources:
         raise ValueError(f"No sources defined for tie {tie_name}")
 
-    unique_keys = _build_tie_unique_keys(roles)
+    # Resolved once in _get_blueprints rather than on every query build
+    unique_keys = blueprint["unique_key"]
     system_col = f"{tie_name}_System"
     tenant_col = f"{tie_name}_Tenant"
     changed_at_col = f"{tie_name}_ChangedAt"
     loaded_at_col = f"{tie_name}_LoadedAt"
 
-    selects = [_build_tie_select(tie_name, roles, src, anchor_descriptors, execution_ts) for src in sources]
+    selects = [_build_tie_select(tie_name, roles, src, execution_ts) for src in sources]
 
-    output_columns = (
-        [(k, "VARCHAR") for k in unique_keys]
-        + [(system_col, "VARCHAR"), (tenant_col, "VARCHAR")]
-        + [(changed_at_col, "TIMESTAMP"), (loaded_at_col, "TIMESTAMP")]
-    )
+    output_columns = [
+        *((k, "VARCHAR") for k in unique_keys),
+        (system_col, "VARCHAR"),
+        (tenant_col, "VARCHAR"),
+        (changed_at_col, "TIMESTAMP"),
+        (loaded_at_col, "TIMESTAMP"),
+    ]
 
     return _build_incremental_query(
         source_query=_union_all(selects),
@@ -714,44 +854,32 @@ def _build_attribute_select(
     # Value column - for knotted attributes, build knot ID reference
     if is_knotted and knot_descriptor:
         # Build knot ID: Descriptor@system[~tenant]|value
-        value_col = exp.Column(this=exp.to_identifier(value))
-        if tenant:
-            value_expr = exp.func(
-                "CONCAT",
-                exp.Literal.string(f"{knot_descriptor}@{system}~{tenant}|"),
-                exp.cast(value_col, exp.DataType.build("TEXT")),
-            )
-        else:
-            value_expr = exp.func(
-                "CONCAT",
-                exp.Literal.string(f"{knot_descriptor}@{system}|"),
-                exp.cast(value_col, exp.DataType.build("TEXT")),
-            )
+        value_expr = _build_keyset_expression(knot_descriptor, system, value, tenant, cast_type="TEXT")
     else:
         # Regular attribute - just use the value
-        value_expr = exp.Column(this=exp.to_identifier(value))
+        value_expr = exp.Column(this=_identifier(value))
 
     # Build columns list
     columns = [
-        keyset_expr.as_(f"{attr_name}_ID"),
-        value_expr.as_(f"{attr_name}_{attr_descriptor}"),
-        exp.Literal.string(system).as_(f"{attr_name}_System"),
-        tenant_expr.as_(f"{attr_name}_Tenant"),
+        _alias(keyset_expr, f"{attr_name}_ID"),
+        _alias(value_expr, f"{attr_name}_{attr_descriptor}"),
+        _alias(exp.Literal.string(system), f"{attr_name}_System"),
+        _alias(tenant_expr, f"{attr_name}_Tenant"),
     ]
 
     # Add ChangedAt only for historized attributes
     if is_historized:
         if changed_at_col:
-            changed_at_expr = exp.Column(this=exp.to_identifier(changed_at_col))
+            changed_at_expr = exp.Column(this=_identifier(changed_at_col))
         else:
-            changed_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
-        columns.append(changed_at_expr.as_(f"{attr_name}_ChangedAt"))
+            changed_at_expr = _timestamp_literal(execution_ts)
+        columns.append(_alias(changed_at_expr, f"{attr_name}_ChangedAt"))
 
     # Always add LoadedAt
-    loaded_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
-    columns.append(loaded_at_expr.as_(f"{attr_name}_LoadedAt"))
+    loaded_at_expr = _timestamp_literal(execution_ts)
+    columns.append(_alias(loaded_at_expr, f"{attr_name}_LoadedAt"))
 
-    return exp.select(*columns).from_(table)
+    return _select_from(columns, table)
 
 
 def _build_attribute_query(blueprint: dict[str, Any], execution_ts: str, model_name: str) -> exp.Expression:
@@ -819,34 +947,22 @@ def _build_knot_select(
 
     # Build knot ID from value (knots use value as the identifier)
     # Format: Descriptor@system[~tenant]|value
-    value_col = exp.Column(this=exp.to_identifier(value))
-
-    if tenant:
-        id_expr = exp.func(
-            "CONCAT",
-            exp.Literal.string(f"{descriptor}@{system}~{tenant}|"),
-            exp.cast(value_col, exp.DataType.build("TEXT")),
-        )
-    else:
-        id_expr = exp.func(
-            "CONCAT",
-            exp.Literal.string(f"{descriptor}@{system}|"),
-            exp.cast(value_col, exp.DataType.build("TEXT")),
-        )
+    id_expr = _build_keyset_expression(descriptor, system, value, tenant, cast_type="TEXT")
+    value_col = exp.Column(this=_identifier(value))
 
     tenant_expr = exp.Literal.string(tenant) if tenant else exp.Null()
-    loaded_at_expr = exp.cast(exp.Literal.string(execution_ts), exp.DataType.build("timestamp"))
+    loaded_at_expr = _timestamp_literal(execution_ts)
 
     columns = [
-        id_expr.as_(f"{mnemonic}_ID"),
-        value_col.as_(f"{mnemonic}_{descriptor}"),
-        exp.Literal.string(system).as_(f"{mnemonic}_System"),
-        tenant_expr.as_(f"{mnemonic}_Tenant"),
-        loaded_at_expr.as_(f"{mnemonic}_LoadedAt"),
+        _alias(id_expr, f"{mnemonic}_ID"),
+        _alias(value_col, f"{mnemonic}_{descriptor}"),
+        _alias(exp.Literal.string(system), f"{mnemonic}_System"),
+        _alias(tenant_expr, f"{mnemonic}_Tenant"),
+        _alias(loaded_at_expr, f"{mnemonic}_LoadedAt"),
     ]
 
     # DISTINCT is critical for knots - we only want unique values
-    return exp.select(*columns).from_(table).distinct()
+    return _select_from(columns, table, distinct=True)
 
 
 def _build_knot_query(blueprint: dict[str, Any], execution_ts: str, model_name: str) -> exp.Expression:
@@ -886,12 +1002,15 @@ def _build_knot_query(blueprint: dict[str, Any], execution_ts: str, model_name:
 
 
 def _get_blueprints() -> list[dict[str, Any]]:
-    """Generate blueprint configurations for all anchor model entities."""
-    model_data = _load_model()
-    _validate_model(model_data)
+    """
+    Generate blueprint configurations for all anchor model entities.
+
+    The roles, sources and unique_key values are the lists of the cached model,
+    not copies: blueprints are read-only, like the model they come from.
+    """
+    model_data = _validated_model()
 
-    anchor_descriptors = {mnemonic: config["descriptor"] for mnemonic, config in model_data["anchors"].items()}
-    knot_descriptors = {mnemonic: config["descriptor"] for mnemonic, config in model_data.get("knots", {}).items()}
+    knot_descriptors = model_data["knot_descriptors"]
 
     blueprints = []
 
@@ -914,8 +1033,7 @@ def _get_blueprints() -> list[dict[str, Any]]:
             "name": tie_name,
             "roles": config["roles"],
             "sources": config.get("sources", []),
-            "unique_key": _build_tie_unique_keys(config["roles"]),
-            "anchor_descriptors": anchor_descriptors,
+            "unique_key": config["unique_key"],
         })
 
     # Attributes
@@ -17,9 +17,11 @@ Files:
 - model.yaml : Full YAML export (edit sources here, sync writes them back to XML)
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 import re
+import string
 import xml.etree.ElementTree as ET
 
 import yaml
@@ -31,27 +33,56 @@ import yaml
 MODEL_XML = Path(__file__).parent / "model.xml"
 MODEL_YAML = Path(__file__).parent / "model.yaml"
 
+# Prefer libyaml's C loader/dumper; fall back to the pure-Python ones if PyYAML was built without it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 # ---------------------------------------------------------------------------
 # Case Conversion
 # ---------------------------------------------------------------------------
 
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_LOWER_OR_DIGIT = _LOWER | frozenset(string.digits)
+
+
+@lru_cache(maxsize=1024)
 def to_snake_case(name: str) -> str:
     """Convert PascalCase/camelCase to snake_case."""
-    s1 = re.sub(r'(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    # One scan instead of two regex passes: a capital starts a new word after a lowercase
+    # letter or digit (productId), or where a capitalised word follows an acronym (HTTPResponse).
+    # The '\n' check mirrors the old regex, whose `.` did not match a newline before the capital.
+    chars = []
+    last = len(name) - 1
+    for i, ch in enumerate(name):
+        if i and ch in _UPPER and (
+            name[i - 1] in _LOWER_OR_DIGIT or (i < last and name[i + 1] in _LOWER and name[i - 1] != '\n')
+        ):
+            chars.append('_')
+        chars.append(ch)
+    return ''.join(chars).lower()
 
 
 # ---------------------------------------------------------------------------
 # XML Parsing Helpers
 # ---------------------------------------------------------------------------
 
+# A superset of what int()/float() accept. Values it rejects cannot be numbers, so the common
+# non-numeric attributes (names, dates, types) return without raising and catching ValueError.
+_NUMBER_LIKE_RE = re.compile(r'\s*[+-]?[\d_]*(?:\.[\d_]*)?(?:[eE][+-]?[\d_]+)?\s*')
+
+
+@lru_cache(maxsize=4096)
 def parse_value(value: str) -> Any:
     """Convert string value to appropriate type."""
-    if value.lower() == "true":
+    lowered = value.lower()
+    if lowered == "true":
         return True
-    if value.lower() == "false":
+    if lowered == "false":
         return False
+    if not _NUMBER_LIKE_RE.fullmatch(value):
+        return value
     try:
         if "." in value:
             return float(value)
@@ -62,10 +93,7 @@ def parse_value(value: str) -> Any:
 
 def element_to_dict(elem: ET.Element) -> dict[str, Any]:
     """Convert XML element attributes to dict."""
-    result = {}
-    for key, value in elem.attrib.items():
-        result[key] = parse_value(value)
-    return result
+    return {key: parse_value(value) for key, value in elem.attrib.items()}
 
 
 def parse_description_sources(elem: ET.Element) -> list[dict[str, Any]]:
@@ -75,21 +103,22 @@ def parse_description_sources(elem: ET.Element) -> list[dict[str, Any]]:
         return []
 
     sources = []
-    for source_elem in desc_elem.findall("source"):
-        source = {}
-        for key, value in source_elem.attrib.items():
-            source[key] = value
+    for source_elem in desc_elem.iterfind("source"):
+        source = dict(source_elem.attrib)
+
+        # One pass over the children serves both the <key> and <keys> lookups
+        children = list(source_elem)
 
         # Parse nested <key> elements for composite keys
-        key_elems = source_elem.findall("key")
+        key_elems = [child for child in children if child.tag == "key"]
         if key_elems:
-            if len(key_elems) == 1 and not key_elems[0].findall("col"):
+            key_cols = [key_elem.findall("col") for key_elem in key_elems]
+            if len(key_elems) == 1 and not key_cols[0]:
                 source["key"] = to_snake_case(key_elems[0].text)
             else:
                 # Composite key
                 keys = []
-                for key_elem in key_elems:
-                    col_elems = key_elem.findall("col")
+                for key_elem, col_elems in zip(key_elems, key_cols):
                     if col_elems:
                         keys = [to_snake_case(col.text) for col in col_elems]
                     elif key_elem.text:
@@ -97,7 +126,7 @@ def parse_description_sources(elem: ET.Element) -> list[dict[str, Any]]:
                 source["key"] = keys
 
         # Parse nested <keys> for tie key mappings
-        keys_elem = source_elem.find("keys")
+        keys_elem = next((child for child in children if child.tag == "keys"), None)
         if keys_elem is not None:
             key_map = {}
             for key_elem in keys_elem:
@@ -120,89 +149,93 @@ def parse_description_sources(elem: ET.Element) -> list[dict[str, Any]]:
 
 def build_tie_name(roles: list[dict[str, Any]]) -> str:
     """Build canonical tie name from roles."""
-    sorted_roles = sorted(roles, key=lambda r: (not r.get("identifier", False), r["type"]))
-    parts = []
-    for r in sorted_roles:
-        parts.extend([r["type"], r["role"]])
-    return "_".join(parts)
+    # Same decorate-and-sort as blueprint._build_tie_name, so both sides agree on tie names.
+    keyed = sorted((not r.get("identifier", False), r["type"], i, r["role"]) for i, r in enumerate(roles))
+    return "_".join(f"{anchor_type}_{role}" for _, anchor_type, _, role in keyed)
 
 
 # ---------------------------------------------------------------------------
 # XML Parsing (Full)
 # ---------------------------------------------------------------------------
 
-def parse_xml_full(path: Path) -> dict[str, Any]:
-    """
-    Parse full XML structure to dict.
-    Sources are read from <description> elements.
-    """
-    tree = ET.parse(path)
-    root = tree.getroot()
+def parse_anchor(anchor_elem: ET.Element) -> dict[str, Any]:
+    """Parse one <anchor> element, including its sources."""
+    anchor_data = element_to_dict(anchor_elem)
 
-    model = {
-        "schema": element_to_dict(root),
-        "anchors": {},
-        "ties": {},
-    }
+    # Parse nested elements
+    meta = anchor_elem.find("metadata")
+    if meta is not None:
+        anchor_data["metadata"] = element_to_dict(meta)
 
-    # Parse schema-level metadata
-    schema_meta = root.find("metadata")
-    if schema_meta is not None:
-        model["schema"]["metadata"] = element_to_dict(schema_meta)
+    layout = anchor_elem.find("layout")
+    if layout is not None:
+        anchor_data["layout"] = element_to_dict(layout)
 
-    # Parse anchors
-    for anchor_elem in root.findall("anchor"):
-        mnemonic = anchor_elem.get("mnemonic")
-        anchor_data = element_to_dict(anchor_elem)
+    # Parse sources (stored in XML <description> element)
+    anchor_data["sources"] = parse_description_sources(anchor_elem)
 
-        # Parse nested elements
-        meta = anchor_elem.find("metadata")
-        if meta is not None:
-            anchor_data["metadata"] = element_to_dict(meta)
+    return anchor_data
 
-        layout = anchor_elem.find("layout")
-        if layout is not None:
-            anchor_data["layout"] = element_to_dict(layout)
 
-        # Parse sources (stored in XML <description> element)
-        anchor_data["sources"] = parse_description_sources(anchor_elem)
+def parse_tie(tie_elem: ET.Element) -> tuple[str, dict[str, Any]]:
+    """Parse one <tie> element, including its sources; returns (tie_name, tie_data)."""
+    tie_data = element_to_dict(tie_elem)
 
-        model["anchors"][mnemonic] = anchor_data
+    # Parse anchor roles
+    role_elems = tie_elem.findall("anchorRole")
+    roles = [element_to_dict(role_elem) for role_elem in role_elems]
+    tie_data["roles"] = roles
 
-    # Parse ties
-    for tie_elem in root.findall("tie"):
-        tie_data = element_to_dict(tie_elem)
+    # Parse nested elements
+    meta = tie_elem.find("metadata")
+    if meta is not None:
+        tie_data["metadata"] = element_to_dict(meta)
 
-        # Parse anchor roles
-        roles = []
-        for role_elem in tie_elem.findall("anchorRole"):
-            roles.append(element_to_dict(role_elem))
-        tie_data["roles"] = roles
+    layout = tie_elem.find("layout")
+    if layout is not None:
+        tie_data["layout"] = element_to_dict(layout)
 
-        # Parse nested elements
-        meta = tie_elem.find("metadata")
-        if meta is not None:
-            tie_data["metadata"] = element_to_dict(meta)
+    # Parse sources (stored in XML <description> element on tie or first anchorRole)
+    sources = parse_description_sources(tie_elem)
+    if not sources and role_elems:
+        sources = parse_description_sources(role_elems[0])
 
-        layout = tie_elem.find("layout")
-        if layout is not None:
-            tie_data["layout"] = element_to_dict(layout)
+    tie_data["sources"] = sources
 
-        # Parse sources (stored in XML <description> element on tie or first anchorRole)
-        sources = parse_description_sources(tie_elem)
-        if not sources:
-            first_role = tie_elem.find("anchorRole")
-            if first_role is not None:
-                sources = parse_description_sources(first_role)
+    return build_tie_name(roles), tie_data
 
-        tie_data["sources"] = sources
 
-        tie_name = build_tie_name(roles)
+def parse_schema_child(model: dict[str, Any], elem: ET.Element) -> None:
+    """Add one direct child of <schema> (anchor, tie or schema-level metadata) to model."""
+    if elem.tag == "anchor":
+        model["anchors"][elem.get("mnemonic")] = parse_anchor(elem)
+    elif elem.tag == "tie":
+        tie_name, tie_data = parse_tie(elem)
         model["ties"][tie_name] = tie_data
+    elif elem.tag == "metadata" and "metadata" not in model["schema"]:
+        # Schema-level metadata
+        model["schema"]["metadata"] = element_to_dict(elem)
 
+
+def parse_xml_tree(root: ET.Element) -> dict[str, Any]:
+    """
+    Parse an already loaded <schema> element to dict, leaving the tree intact.
+    Sources are read from <description> elements.
+    """
+    model: dict[str, Any] = {"schema": element_to_dict(root), "anchors": {}, "ties": {}}
+    for elem in root:
+        parse_schema_child(model, elem)
     return model
 
 
+def parse_xml_full(path: Path) -> dict[str, Any]:
+    """
+    Parse full XML structure to dict.
+    Sources are read from <description> elements.
+    """
+    return parse_xml_tree(ET.parse(path).getroot())
+
+
 # ---------------------------------------------------------------------------
 # YAML Loading
 # ---------------------------------------------------------------------------
@@ -211,8 +244,8 @@ def load_model_yaml(path: Path = MODEL_YAML) -> dict[str, Any]:
     """Load existing model.yaml."""
     if not path.exists():
         return {"anchors": {}, "ties": {}}
-    with open(path) as f:
-        return yaml.safe_load(f) or {"anchors": {}, "ties": {}}
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {"anchors": {}, "ties": {}}
 
 
 # ---------------------------------------------------------------------------
@@ -221,9 +254,8 @@ def load_model_yaml(path: Path = MODEL_YAML) -> dict[str, Any]:
 
 def build_source_xml(parent: ET.Element, sources: list[dict[str, Any]]) -> None:
     """Build <source> XML elements under parent."""
-    # Clear existing source elements
-    for old in parent.findall("source"):
-        parent.remove(old)
+    # Clear existing source elements in one slice assignment; remove() rescans the children each time
+    parent[:] = [child for child in parent if child.tag != "source"]
 
     for src in sources:
         source_elem = ET.SubElement(parent, "source")
@@ -233,13 +265,12 @@ def build_source_xml(parent: ET.Element, sources: list[dict[str, Any]]) -> None:
         # Handle anchor key (single or composite)
         if "key" in src:
             key = src["key"]
+            key_elem = ET.SubElement(source_elem, "key")
             if isinstance(key, list):
-                key_elem = ET.SubElement(source_elem, "key")
                 for col in key:
                     col_elem = ET.SubElement(key_elem, "col")
                     col_elem.text = col
             else:
-                key_elem = ET.SubElement(source_elem, "key")
                 key_elem.text = key
 
         # Handle tie keys mapping
@@ -258,15 +289,17 @@ def build_source_xml(parent: ET.Element, sources: list[dict[str, Any]]) -> None:
 def write_sources_to_xml(
     xml_path: Path,
     model: dict[str, Any],
+    root: ET.Element | None = None,
 ) -> None:
     """
     Write sources back to XML <description><source> elements.
+    Pass the already parsed <schema> element as root to skip re-reading xml_path.
     """
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+    if root is None:
+        root = ET.parse(xml_path).getroot()
 
     # Update anchor descriptions
-    for anchor_elem in root.findall("anchor"):
+    for anchor_elem in root.iterfind("anchor"):
         mnemonic = anchor_elem.get("mnemonic")
         if mnemonic not in model["anchors"]:
             continue
@@ -285,10 +318,11 @@ def write_sources_to_xml(
         build_source_xml(desc_elem, sources)
 
     # Update tie descriptions
-    for tie_elem in root.findall("tie"):
+    for tie_elem in root.iterfind("tie"):
         # Build tie name from roles
+        role_elems = tie_elem.findall("anchorRole")
         roles = []
-        for role_elem in tie_elem.findall("anchorRole"):
+        for role_elem in role_elems:
             roles.append({
                 "role": role_elem.get("role"),
                 "type": role_elem.get("type"),
@@ -304,8 +338,8 @@ def write_sources_to_xml(
             continue
 
         # Find or create <description> on first anchorRole
-        first_role = tie_elem.find("anchorRole")
-        if first_role is not None:
+        if role_elems:
+            first_role = role_elems[0]
             desc_elem = first_role.find("description")
             if desc_elem is None:
                 desc_elem = ET.SubElement(first_role, "description")
@@ -313,26 +347,28 @@ def write_sources_to_xml(
             desc_elem.text = None
             build_source_xml(desc_elem, sources)
 
-    # Pretty print and write back to XML
-    indent_xml(root)
-    tree.write(xml_path, encoding="unicode")
+    # Pretty print and write back to XML; the trailing newline after </schema> is kept
+    ET.indent(root, space="  ")
+    root.tail = "\n"
+    # Same encoding ElementTree.write uses for encoding="unicode" output
+    write_if_changed(xml_path, ET.tostring(root, encoding="unicode"), errors="xmlcharrefreplace")
 
 
-def indent_xml(elem: ET.Element, level: int = 0) -> None:
-    """Add indentation to XML elements for pretty printing."""
-    indent = "\n" + "  " * level
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = indent + "  "
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = indent
-        for child in elem:
-            indent_xml(child, level + 1)
-        if not child.tail or not child.tail.strip():
-            child.tail = indent
-    else:
-        if level and (not elem.tail or not elem.tail.strip()):
-            elem.tail = indent
+def write_if_changed(path: Path, text: str, errors: str = "strict") -> bool:
+    """
+    Write text to path as UTF-8 unless the file already holds exactly that text.
+    Leaving unchanged files untouched keeps their mtimes, so mtime-keyed caches stay valid.
+    errors is passed to open() for the write, e.g. "xmlcharrefreplace" for XML output.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    with open(path, "w", encoding="utf-8", errors=errors) as f:
+        f.write(text)
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -350,35 +386,44 @@ def sync_model(
     3. Write model.yaml
     4. Write sources back to XML <description>
     """
-    # Parse XML (sources from <description>)
-    model = parse_xml_full(xml_path)
+    # Parse XML once (sources from <description>); the tree is reused for the write-back
+    root = ET.parse(xml_path).getroot()
+    model = parse_xml_tree(root)
 
     # Load existing YAML to get edited sources
     existing_yaml = load_model_yaml(yaml_path)
 
     # Merge: YAML sources take precedence (user edits there)
+    yaml_anchors = existing_yaml.get("anchors") or {}
+    yaml_ties = existing_yaml.get("ties") or {}
+
+    # Entities left without sources after the merge are collected on the same pass
+    missing_anchor_sources = []
     for mnemonic, anchor_data in model["anchors"].items():
-        if mnemonic in existing_yaml.get("anchors", {}):
-            yaml_sources = existing_yaml["anchors"][mnemonic].get("sources", [])
+        if mnemonic in yaml_anchors:
+            yaml_sources = yaml_anchors[mnemonic].get("sources")
             if yaml_sources:
                 anchor_data["sources"] = yaml_sources
+        if not anchor_data["sources"]:
+            missing_anchor_sources.append(mnemonic)
 
+    missing_tie_sources = []
     for tie_name, tie_data in model["ties"].items():
-        if tie_name in existing_yaml.get("ties", {}):
-            yaml_sources = existing_yaml["ties"][tie_name].get("sources", [])
+        if tie_name in yaml_ties:
+            yaml_sources = yaml_ties[tie_name].get("sources")
             if yaml_sources:
                 tie_data["sources"] = yaml_sources
+        if not tie_data["sources"]:
+            missing_tie_sources.append(tie_name)
 
     # Write YAML
-    with open(yaml_path, "w") as f:
-        yaml.dump(model, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_if_changed(
+        yaml_path,
+        yaml.dump(model, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False, allow_unicode=True),
+    )
 
     # Write sources back to XML <description> elements
-    write_sources_to_xml(xml_path, model)
-
-    # Stats
-    missing_anchor_sources = [m for m, a in model["anchors"].items() if not a.get("sources")]
-    missing_tie_sources = [t for t, c in model["ties"].items() if not c.get("sources")]
+    write_sources_to_xml(xml_path, model, root)
 
     return {
         "model": model,
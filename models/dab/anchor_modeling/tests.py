@@ -15,12 +15,33 @@ from . import blueprint
 from . import sync
 
 
+# ---------------------------------------------------------------------------
+# Blueprint Tests - Column Name Conversion
+# ---------------------------------------------------------------------------
+
+
+class TestCamelToSnake:
+    def test_docstring_examples(self):
+        assert blueprint._camel_to_snake("orderId") == "order_id"
+        assert blueprint._camel_to_snake("customerId") == "customer_id"
+        assert blueprint._camel_to_snake("bool_isCamelCase") == "bool__is_camel_case"
+        assert blueprint._camel_to_snake("EM_reports") == "em__reports"
+
+    def test_no_boundary_across_underscores(self):
+        assert blueprint._camel_to_snake("a_B") == "a__b"
+        assert blueprint._camel_to_snake("_leading") == "__leading"
+
+
 # ---------------------------------------------------------------------------
 # Blueprint Tests - Keyset Expression
 # ---------------------------------------------------------------------------
 
 
 class TestBuildKeysetExpression:
+    def test_anchor_keys_cast_to_varchar(self):
+        expr = blueprint._build_keyset_expression("Product", "nw", "product_id")
+        assert "CAST(product_id AS VARCHAR)" in expr.sql(dialect="postgres")
+
     def test_single_key(self):
         expr = blueprint._build_keyset_expression("Product", "nw", "product_id")
         sql = expr.sql()
@@ -39,6 +60,44 @@ class TestBuildKeysetExpression:
         assert "order_id" in sql
         assert "product_id" in sql
 
+    def test_composite_key_is_single_flat_concat(self):
+        expr = blueprint._build_keyset_expression("OrderDetail", "nw", ["order_id", "product_id"])
+        assert isinstance(expr, exp.Concat)
+        assert len(expr.expressions) == 4
+        assert not any(isinstance(part, exp.Concat) for part in expr.expressions)
+        assert expr.sql(dialect="duckdb") == (
+            "CONCAT('OrderDetail@nw|', CAST(order_id AS TEXT), '|', CAST(product_id AS TEXT))"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Blueprint Tests - Data Types
+# ---------------------------------------------------------------------------
+
+
+class TestDataType:
+    def test_returns_fresh_nodes(self):
+        assert blueprint._data_type("VARCHAR") is not blueprint._data_type("VARCHAR")
+
+    def test_name_is_case_insensitive(self):
+        assert blueprint._data_type("timestamp") == blueprint._data_type("TIMESTAMP")
+
+    def test_unknown_type_is_parsed(self):
+        assert blueprint._data_type("DECIMAL(10, 2)").sql() == "DECIMAL(10, 2)"
+
+    def test_timestamp_literal(self):
+        expr = blueprint._timestamp_literal("2024-01-01T00:00:00")
+        assert expr.sql() == "CAST('2024-01-01T00:00:00' AS TIMESTAMP)"
+
+
+class TestIdentifier:
+    def test_matches_to_identifier(self):
+        for name in ["order_id", "OH_ID_in", "order id", "1st"]:
+            assert blueprint._identifier(name) == exp.to_identifier(name)
+
+    def test_returns_fresh_node(self):
+        assert blueprint._identifier("order_id") is not blueprint._identifier("order_id")
+
 
 # ---------------------------------------------------------------------------
 # Blueprint Tests - Union All
@@ -66,6 +125,14 @@ class TestUnionAll:
         sql = result.sql()
         assert sql.count("UNION ALL") == 2
 
+    def test_many_selects_keep_order_in_balanced_tree(self):
+        selects = [exp.select("x").from_(f"t{i}") for i in range(5)]
+        result = blueprint._union_all(selects)
+        assert result.sql() == " UNION ALL ".join(f"SELECT x FROM t{i}" for i in range(5))
+        assert isinstance(result.this, exp.Union)
+        assert isinstance(result.this.this, exp.Union)
+        assert result.expression.sql() == "SELECT x FROM t4"
+
 
 # ---------------------------------------------------------------------------
 # Blueprint Tests - Tie Unique Keys
@@ -196,6 +263,18 @@ class TestValidateTieSources:
         assert "missing fields" in stubs[0]
         assert "keys" in stubs[0]
 
+    def test_missing_fields_are_listed_in_declared_order(self):
+        model_data = {
+            "ties": {
+                "OR_order_PR_product": {
+                    "roles": [{"type": "OR", "role": "order"}, {"type": "PR", "role": "product"}],
+                    "sources": [{"system": "nw"}],
+                }
+            }
+        }
+        stubs = blueprint._validate_tie_sources(model_data)
+        assert "missing fields: ['table', 'keys']" in stubs[0]
+
     def test_self_referencing_tie_stub_has_role_specific_keys(self):
         """Test that ties with same anchor type use role-specific keys in stub."""
         model_data = {
@@ -324,6 +403,202 @@ class TestValidateModel:
         assert "PE_employee: ???" in error_msg
 
 
+# ---------------------------------------------------------------------------
+# Blueprint Tests - Model Loading
+# ---------------------------------------------------------------------------
+
+
+class TestLoadSources:
+    def test_missing_file_returns_empty_sections(self):
+        sources = blueprint._load_sources(Path("/nonexistent/sources.yaml"))
+        assert sources == {"anchors": {}, "ties": {}, "attributes": {}, "knots": {}}
+
+    def test_empty_file_returns_empty_sections(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sources_path = Path(tmpdir) / "sources.yaml"
+            sources_path.write_text("")
+            sources = blueprint._load_sources(sources_path)
+        assert sources == {"anchors": {}, "ties": {}, "attributes": {}, "knots": {}}
+
+    def test_loads_utf8_sources(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sources_path = Path(tmpdir) / "sources.yaml"
+            sources_path.write_text(
+                "anchors:\n"
+                "  PR:  # Produkt\n"
+                "    - system: nw\n"
+                "      table: produkter\n"
+                "      key: [order_id, product_id]\n",
+                encoding="utf-8",
+            )
+            sources = blueprint._load_sources(sources_path)
+        assert sources["anchors"]["PR"] == [
+            {"system": "nw", "table": "produkter", "key": ["order_id", "product_id"]}
+        ]
+
+
+class TestParseXmlStructure:
+    def test_parses_anchors_attributes_ties_and_knots(self):
+        xml_content = """<schema format="0.99">
+    <knot mnemonic="COU" descriptor="Country" dataRange="text"/>
+    <anchor mnemonic="OH" descriptor="Orders">
+        <metadata capsule="public"/>
+        <attribute mnemonic="SHA" descriptor="ShipAddress" timeRange="timestamp" dataRange="text"/>
+        <attribute mnemonic="SCY" descriptor="ShipCountry" knotRange="COU"/>
+    </anchor>
+    <anchor mnemonic="CU" descriptor="Customers"/>
+    <tie>
+        <anchorRole role="isPlaced" type="OH" identifier="true"/>
+        <anchorRole role="by" type="CU" identifier="false"/>
+    </tie>
+</schema>"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            xml_path.write_text(xml_content)
+            structure = blueprint._parse_xml_structure(xml_path)
+
+        assert list(structure["anchors"]) == ["OH", "CU"]
+        assert structure["anchors"]["OH"] == {"mnemonic": "OH", "descriptor": "Orders"}
+
+        assert list(structure["attributes"]) == ["OH_SHA", "OH_SCY"]
+        assert structure["attributes"]["OH_SHA"]["is_historized"] is True
+        assert structure["attributes"]["OH_SHA"]["is_knotted"] is False
+        assert structure["attributes"]["OH_SCY"]["is_historized"] is False
+        assert structure["attributes"]["OH_SCY"]["knot_range"] == "COU"
+
+        assert list(structure["ties"]) == ["OH_isPlaced_CU_by"]
+        assert structure["ties"]["OH_isPlaced_CU_by"]["roles"][0] == {
+            "type": "OH", "role": "isPlaced", "identifier": True
+        }
+        assert structure["ties"]["OH_isPlaced_CU_by"]["unique_key"] == ["OH_ID_isPlaced", "CU_ID_by"]
+
+        assert structure["knots"]["COU"] == {"mnemonic": "COU", "descriptor": "Country", "data_range": "text"}
+
+
+class TestBuildTieNameBlueprint:
+    def test_identifier_roles_first_then_by_type(self):
+        roles = [
+            {"type": "PR", "role": "product", "identifier": False},
+            {"type": "OR", "role": "order", "identifier": True},
+        ]
+        assert blueprint._build_tie_name(roles) == "OR_order_PR_product"
+
+    def test_same_anchor_roles_keep_xml_order(self):
+        roles = [
+            {"type": "EM", "role": "subordinate", "identifier": True},
+            {"type": "EM", "role": "manager", "identifier": True},
+        ]
+        assert blueprint._build_tie_name(roles) == "EM_subordinate_EM_manager"
+
+
+class TestLoadModelForMtimes:
+    XML = """<schema format="0.99">
+    <anchor mnemonic="PR" descriptor="Product"/>
+</schema>"""
+
+    @staticmethod
+    def _load(xml_path, sources_path):
+        return blueprint._load_model_for_mtimes(
+            xml_path, blueprint._mtime_ns(xml_path), sources_path, blueprint._mtime_ns(sources_path)
+        )
+
+    def test_returns_same_result_while_files_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            sources_path = Path(tmpdir) / "sources.yaml"
+            xml_path.write_text(self.XML)
+            sources_path.write_text("anchors:\n  PR:\n    - {system: nw, table: products, key: product_id}\n")
+
+            first = self._load(xml_path, sources_path)
+            second = self._load(xml_path, sources_path)
+
+        assert first is second
+        assert first["anchors"]["PR"]["sources"][0]["table"] == "products"
+        assert first["knot_descriptors"] == {}
+
+    def test_reloads_when_sources_change(self):
+        import os
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            sources_path = Path(tmpdir) / "sources.yaml"
+            xml_path.write_text(self.XML)
+            sources_path.write_text("anchors:\n  PR:\n    - {system: nw, table: products, key: product_id}\n")
+            first = self._load(xml_path, sources_path)
+
+            sources_path.write_text("anchors:\n  PR:\n    - {system: erp, table: items, key: item_id}\n")
+            stat = sources_path.stat()
+            os.utime(sources_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            second = self._load(xml_path, sources_path)
+
+        assert first is not second
+        assert second["anchors"]["PR"]["sources"][0]["table"] == "items"
+
+    def test_tie_roles_carry_anchor_descriptors(self):
+        xml = """<schema format="0.99">
+    <anchor mnemonic="OR" descriptor="Order"/>
+    <anchor mnemonic="PR" descriptor="Product"/>
+    <tie>
+        <anchorRole role="order" type="OR" identifier="true"/>
+        <anchorRole role="product" type="PR" identifier="false"/>
+    </tie>
+</schema>"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            sources_path = Path(tmpdir) / "sources.yaml"
+            xml_path.write_text(xml)
+            sources_path.write_text("anchors: {}\n")
+
+            model_data = blueprint._load_model(xml_path, sources_path)
+
+        roles = model_data["ties"]["OR_order_PR_product"]["roles"]
+        assert [r["descriptor"] for r in roles] == ["Order", "Product"]
+
+    def test_tie_role_with_unknown_anchor_raises(self):
+        xml = """<schema format="0.99">
+    <anchor mnemonic="OR" descriptor="Order"/>
+    <tie>
+        <anchorRole role="order" type="OR" identifier="true"/>
+        <anchorRole role="product" type="PR" identifier="false"/>
+    </tie>
+</schema>"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            sources_path = Path(tmpdir) / "sources.yaml"
+            xml_path.write_text(xml)
+            sources_path.write_text("anchors: {}\n")
+
+            with pytest.raises(blueprint.ModelValidationError, match="unknown anchor PR"):
+                blueprint._load_model(xml_path, sources_path)
+
+
+class TestValidatedModel:
+    XML = TestLoadModelForMtimes.XML
+
+    def test_returns_same_result_while_files_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            sources_path = Path(tmpdir) / "sources.yaml"
+            xml_path.write_text(self.XML)
+            sources_path.write_text("anchors:\n  PR:\n    - {system: nw, table: products, key: product_id}\n")
+
+            first = blueprint._validated_model(xml_path, sources_path)
+            second = blueprint._validated_model(xml_path, sources_path)
+
+        assert first is second
+
+    def test_invalid_model_raises_on_every_call(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            sources_path = Path(tmpdir) / "sources.yaml"
+            xml_path.write_text(self.XML)
+            sources_path.write_text("anchors: {}\n")
+
+            for _ in range(2):
+                with pytest.raises(blueprint.ModelValidationError, match="PR"):
+                    blueprint._validated_model(xml_path, sources_path)
+
+
 # ---------------------------------------------------------------------------
 # Blueprint Tests - Anchor Query Generation
 # ---------------------------------------------------------------------------
@@ -356,18 +631,15 @@ class TestBuildAnchorSelect:
 class TestBuildTieSelect:
     def test_basic_tie_select(self):
         roles = [
-            {"type": "OR", "role": "order"},
-            {"type": "PR", "role": "product"},
+            {"type": "OR", "role": "order", "descriptor": "Order"},
+            {"type": "PR", "role": "product", "descriptor": "Product"},
         ]
         source = {
             "system": "nw",
             "table": "order_details",
             "keys": {"OR": "order_id", "PR": "product_id"},
         }
-        anchor_descriptors = {"OR": "Order", "PR": "Product"}
-        select = blueprint._build_tie_select(
-            "OR_order_PR_product", roles, source, anchor_descriptors, "2024-01-01T00:00:00"
-        )
+        select = blueprint._build_tie_select("OR_order_PR_product", roles, source, "2024-01-01T00:00:00")
         sql = select.sql()
         assert "OR_ID_order" in sql
         assert "PR_ID_product" in sql
@@ -378,27 +650,24 @@ class TestBuildTieSelect:
     def test_tie_select_with_role_specific_keys(self):
         """Test tie with same anchor type appearing twice (e.g., manager/employee)."""
         roles = [
-            {"type": "PE", "role": "manager"},
-            {"type": "PE", "role": "employee"},
+            {"type": "PE", "role": "manager", "descriptor": "Person"},
+            {"type": "PE", "role": "employee", "descriptor": "Person"},
         ]
         source = {
             "system": "nw",
             "table": "reports_to",
             "keys": {"PE_manager": "manager_id", "PE_employee": "employee_id"},
         }
-        anchor_descriptors = {"PE": "Person"}
-        select = blueprint._build_tie_select(
-            "PE_manager_PE_employee", roles, source, anchor_descriptors, "2024-01-01T00:00:00"
-        )
+        select = blueprint._build_tie_select("PE_manager_PE_employee", roles, source, "2024-01-01T00:00:00")
         sql = select.sql()
         assert "PE_ID_manager" in sql
         assert "PE_ID_employee" in sql
 
     def test_tie_select_missing_key_raises(self):
-        roles = [{"type": "XX", "role": "unknown"}]
+        roles = [{"type": "XX", "role": "unknown", "descriptor": "X"}]
         source = {"system": "nw", "table": "t", "keys": {}}
         with pytest.raises(ValueError, match="no key mapping"):
-            blueprint._build_tie_select("XX_unknown", roles, source, {"XX": "X"}, "2024-01-01")
+            blueprint._build_tie_select("XX_unknown", roles, source, "2024-01-01")
 
 
 # ---------------------------------------------------------------------------
@@ -437,6 +706,40 @@ class TestBuildIncrementalQuery:
         assert "a" in sql
         assert "b" in sql
 
+    def test_no_node_attached_twice(self):
+        source_query = exp.select("a", "b", "loaded_at").from_("t")
+        query = blueprint._build_incremental_query(
+            source_query=source_query,
+            model_name="model",
+            unique_keys=["a", "b"],
+            loaded_at_col="loaded_at",
+            output_columns=[("a", "VARCHAR"), ("b", "VARCHAR"), ("loaded_at", "TIMESTAMP")],
+        )
+        node_ids = [id(node) for node in query.walk()]
+        assert len(node_ids) == len(set(node_ids))
+        assert query.sql(dialect="duckdb") == (
+            "WITH target AS (SELECT a, b FROM dab.model "
+            "QUALIFY ROW_NUMBER() OVER (PARTITION BY a, b ORDER BY loaded_at DESC) = 1), "
+            "source AS (SELECT a, b, loaded_at FROM t) "
+            "SELECT CAST(source.a AS TEXT) AS a, CAST(source.b AS TEXT) AS b, "
+            "CAST(source.loaded_at AS TIMESTAMP) AS loaded_at "
+            "FROM source ANTI JOIN target ON source.a = target.a AND source.b = target.b"
+        )
+
+    def test_unsafe_key_names_are_quoted_everywhere(self):
+        source_query = exp.select("x").from_("t")
+        query = blueprint._build_incremental_query(
+            source_query=source_query,
+            model_name="model",
+            unique_keys=["order id"],
+            loaded_at_col="loaded_at",
+            output_columns=[("order id", "VARCHAR")],
+        )
+        sql = query.sql(dialect="duckdb")
+        assert 'SELECT "order id" FROM dab.model' in sql
+        assert 'PARTITION BY "order id"' in sql
+        assert 'ON source."order id" = target."order id"' in sql
+
 
 # ---------------------------------------------------------------------------
 # Blueprint Tests - Full Query Generation
@@ -467,9 +770,12 @@ class TestBuildTieQuery:
     def test_builds_full_tie_query(self):
         bp = {
             "name": "OR_order_PR_product",
-            "roles": [{"type": "OR", "role": "order"}, {"type": "PR", "role": "product"}],
+            "roles": [
+                {"type": "OR", "role": "order", "descriptor": "Order"},
+                {"type": "PR", "role": "product", "descriptor": "Product"},
+            ],
             "sources": [{"system": "nw", "table": "order_details", "keys": {"OR": "order_id", "PR": "product_id"}}],
-            "anchor_descriptors": {"OR": "Order", "PR": "Product"},
+            "unique_key": ["OR_ID_order", "PR_ID_product"],
         }
         query = blueprint._build_tie_query(bp, "2024-01-01T00:00:00", "dab.tie__test")
         sql = query.sql()
@@ -479,8 +785,22 @@ class TestBuildTieQuery:
         assert "OR_order_PR_product_LoadedAt" in sql
         assert "WITH" in sql
 
+    def test_partitions_by_blueprint_unique_key(self):
+        bp = {
+            "name": "OR_order_PR_product",
+            "roles": [
+                {"type": "OR", "role": "order", "descriptor": "Order"},
+                {"type": "PR", "role": "product", "descriptor": "Product"},
+            ],
+            "sources": [{"system": "nw", "table": "order_details", "keys": {"OR": "order_id", "PR": "product_id"}}],
+            "unique_key": ["OR_ID_order", "PR_ID_product"],
+        }
+        query = blueprint._build_tie_query(bp, "2024-01-01T00:00:00", "dab.tie__test")
+        window = query.find(exp.Window)
+        assert [c.name for c in window.args["partition_by"]] == bp["unique_key"]
+
     def test_tie_query_no_sources_raises(self):
-        bp = {"name": "test", "roles": [], "sources": [], "anchor_descriptors": {}}
+        bp = {"name": "test", "roles": [], "sources": [], "unique_key": []}
         with pytest.raises(ValueError, match="No sources defined"):
             blueprint._build_tie_query(bp, "2024-01-01", "model")
 
@@ -500,9 +820,12 @@ class TestBuildQuery:
         bp = {
             "entity_type": "tie",
             "name": "test",
-            "roles": [{"type": "OR", "role": "order"}, {"type": "PR", "role": "product"}],
+            "roles": [
+                {"type": "OR", "role": "order", "descriptor": "Order"},
+                {"type": "PR", "role": "product", "descriptor": "Product"},
+            ],
             "sources": [{"system": "nw", "table": "t", "keys": {"OR": "a", "PR": "b"}}],
-            "anchor_descriptors": {"OR": "Order", "PR": "Product"},
+            "unique_key": ["OR_ID_order", "PR_ID_product"],
         }
         query = blueprint._build_query(bp, "2024-01-01", "dab.tie__test")
         assert query is not None
@@ -534,6 +857,12 @@ class TestToSnakeCase:
     def test_single_word(self):
         assert sync.to_snake_case("Product") == "product"
 
+    def test_digit_before_capital(self):
+        assert sync.to_snake_case("Address2Line") == "address2_line"
+
+    def test_trailing_acronym(self):
+        assert sync.to_snake_case("CustomerID") == "customer_id"
+
 
 # ---------------------------------------------------------------------------
 # Sync Tests - Value Parsing
@@ -562,6 +891,17 @@ class TestParseValue:
         assert sync.parse_value("hello") == "hello"
         assert sync.parse_value("Product") == "Product"
 
+    def test_number_like_strings_stay_strings(self):
+        assert sync.parse_value("2026-01-23") == "2026-01-23"
+        assert sync.parse_value("0.99.16") == "0.99.16"
+        assert sync.parse_value("decimal(5,2)") == "decimal(5,2)"
+
+    def test_numeric_edge_cases_match_int_and_float(self):
+        assert sync.parse_value(" 7 ") == 7
+        assert sync.parse_value("1_000") == 1000
+        assert sync.parse_value(".5") == 0.5
+        assert sync.parse_value("1.5e3") == 1500.0
+
 
 # ---------------------------------------------------------------------------
 # Sync Tests - Tie Naming
@@ -586,6 +926,13 @@ class TestBuildTieName:
         # Identifier should come first
         assert name.startswith("OR_order")
 
+    def test_same_anchor_roles_keep_xml_order(self):
+        roles = [
+            {"type": "EM", "role": "subordinate", "identifier": True},
+            {"type": "EM", "role": "manager", "identifier": True},
+        ]
+        assert sync.build_tie_name(roles) == blueprint._build_tie_name(roles) == "EM_subordinate_EM_manager"
+
     def test_alphabetical_when_same_identifier(self):
         roles = [
             {"type": "ZZ", "role": "zebra", "identifier": False},
@@ -664,6 +1011,21 @@ class TestParseDescriptionSources:
         assert sources[0]["keys"] == {"OR": "order_id", "PR": "product_id"}
 
 
+class TestBuildSourceXml:
+    def test_replaces_sources_and_keeps_other_children(self):
+        import xml.etree.ElementTree as ET
+
+        desc = ET.fromstring(
+            '<description><source system="old" table="a"/><note/><source system="old" table="b"/></description>'
+        )
+        sync.build_source_xml(desc, [{"system": "nw", "table": "products", "key": "product_id"}])
+
+        assert [child.tag for child in desc] == ["note", "source"]
+        source = desc.find("source")
+        assert source.get("system") == "nw"
+        assert source.find("key").text == "product_id"
+
+
 # ---------------------------------------------------------------------------
 # Sync Tests - Round Trip
 # ---------------------------------------------------------------------------
@@ -711,6 +1073,137 @@ class TestSyncRoundTrip:
             assert source is not None
             assert source.get("system") == "nw"
 
+    def test_yaml_sources_take_precedence(self):
+        xml_content = """<schema format="0.99">
+    <anchor mnemonic="PR" descriptor="Product">
+        <description>
+            <source system="nw" table="products">
+                <key>product_id</key>
+            </source>
+        </description>
+    </anchor>
+</schema>"""
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            yaml_path = Path(tmpdir) / "model.yaml"
+            xml_path.write_text(xml_content)
+            yaml_path.write_text(
+                "anchors:\n  PR:\n    sources:\n    - {system: erp, table: items, key: item_id}\nties:\n"
+            )
+
+            result = sync.sync_model(xml_path, yaml_path)
+
+        assert result["model"]["anchors"]["PR"]["sources"] == [
+            {"system": "erp", "table": "items", "key": "item_id"}
+        ]
+
+    def test_reports_entities_without_sources(self):
+        xml_content = """<schema format="0.99">
+    <anchor mnemonic="PR" descriptor="Product"/>
+    <anchor mnemonic="OR" descriptor="Order"/>
+    <tie>
+        <anchorRole role="order" type="OR" identifier="true"/>
+        <anchorRole role="product" type="PR" identifier="false"/>
+    </tie>
+</schema>"""
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            yaml_path = Path(tmpdir) / "model.yaml"
+            xml_path.write_text(xml_content)
+            yaml_path.write_text("anchors:\n  OR:\n    sources:\n    - {system: nw, table: orders, key: order_id}\n")
+
+            result = sync.sync_model(xml_path, yaml_path)
+
+        assert result["missing_anchor_sources"] == ["PR"]
+        assert result["missing_tie_sources"] == ["OR_order_PR_product"]
+
+    def test_tree_parser_leaves_tree_intact(self):
+        import xml.etree.ElementTree as ET
+
+        xml_content = """<schema format="0.99">
+    <metadata changingRange="datetime"/>
+    <anchor mnemonic="PR" descriptor="Product">
+        <description>
+            <source system="nw" table="products">
+                <key>product_id</key>
+            </source>
+        </description>
+    </anchor>
+    <tie>
+        <anchorRole role="order" type="OR" identifier="true"/>
+        <anchorRole role="product" type="PR" identifier="false"/>
+    </tie>
+</schema>"""
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            xml_path.write_text(xml_content)
+
+            root = ET.parse(xml_path).getroot()
+            model = sync.parse_xml_tree(root)
+            assert model["anchors"]["PR"]["sources"][0]["key"] == "product_id"
+            assert len(model["ties"]) == 1
+            # The tree is left intact for write_sources_to_xml
+            assert root.find("anchor/description/source") is not None
+
+    def test_non_ascii_content_is_written_as_utf8(self):
+        xml_content = """<schema format="0.99">
+    <anchor mnemonic="PR" descriptor="Product">
+        <description>
+            <source system="nw" table="produkter_å">
+                <key>product_id</key>
+            </source>
+        </description>
+    </anchor>
+</schema>"""
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            yaml_path = Path(tmpdir) / "model.yaml"
+            xml_path.write_text(xml_content, encoding="utf-8")
+            sync.sync_model(xml_path, yaml_path)
+
+            assert "produkter_å" in xml_path.read_bytes().decode("utf-8")
+            assert "produkter_å" in yaml_path.read_bytes().decode("utf-8")
+
+    def test_write_if_changed_replaces_undecodable_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "model.yaml"
+            path.write_bytes("table: produkter_å\n".encode("latin-1"))
+
+            assert sync.write_if_changed(path, "table: produkter_å\n")
+            assert path.read_bytes().decode("utf-8") == "table: produkter_å\n"
+            assert not sync.write_if_changed(path, "table: produkter_å\n")
+
+    def test_resync_leaves_unchanged_files_untouched(self):
+        import os
+
+        xml_content = """<schema format="0.99">
+    <anchor mnemonic="PR" descriptor="Product">
+        <description>
+            <source system="nw" table="products">
+                <key>product_id</key>
+            </source>
+        </description>
+    </anchor>
+</schema>"""
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xml_path = Path(tmpdir) / "model.xml"
+            yaml_path = Path(tmpdir) / "model.yaml"
+            xml_path.write_text(xml_content)
+            sync.sync_model(xml_path, yaml_path)
+
+            # Backdate both outputs so a rewrite would be visible in the mtime
+            for path in (xml_path, yaml_path):
+                os.utime(path, ns=(0, 0))
+            sync.sync_model(xml_path, yaml_path)
+
+            assert xml_path.stat().st_mtime_ns == 0
+            assert yaml_path.stat().st_mtime_ns == 0
+
 
 # ---------------------------------------------------------------------------
 # Integration Test - Full Blueprint
@@ -740,6 +1233,31 @@ class TestGetBlueprints:
             assert bp["model_name"].startswith("tie__")
 
 
+class TestSqlMeshProject:
+    def test_context_loads_and_renders_every_model(self, monkeypatch):
+        import shutil
+
+        from sqlmesh import Context
+
+        project_root = Path(__file__).resolve().parents[3]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Load a copy so the context's cache and database stay out of the repo;
+            # the gateway's relative database path resolves against the cwd
+            monkeypatch.chdir(tmpdir)
+            shutil.copy(project_root / "config.yaml", tmpdir)
+            shutil.copytree(
+                project_root / "models",
+                Path(tmpdir) / "models",
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+
+            context = Context(paths=tmpdir)
+            blueprints = blueprint._get_blueprints()
+            assert len(context.models) == len(blueprints)
+            for name in context.models:
+                assert context.render(name).sql()
+
+
 # ---------------------------------------------------------------------------
 # Attribute Tests
 # ---------------------------------------------------------------------------
@@ -1023,6 +1541,14 @@ class TestBuildKnotSelect:
 
         assert "Country@nw~tenant1|" in sql
 
+    def test_knot_id_keeps_unbounded_text_cast(self):
+        source = {"system": "nw", "table": "orders", "value": "ship_country"}
+        select = blueprint._build_knot_select("COU", "Country", source, "2024-01-01T00:00:00")
+
+        # Bare VARCHAR is 30 characters in T-SQL and would truncate knot values
+        assert "CAST(ship_country AS VARCHAR(MAX))" in select.sql(dialect="tsql")
+        assert "CAST(ship_country AS TEXT)" in select.sql(dialect="postgres")
+
 
 class TestBuildKnotQuery:
     def test_builds_full_knot_query(self):
@@ -1113,6 +1639,9 @@ class TestKnottedAttributeSelect:
         # Should build knot ID reference
         assert "Country@nw|" in sql
 
+        assert "CAST(ship_country AS VARCHAR(MAX))" in select.sql(dialect="tsql")
+        assert "CAST(ship_country AS TEXT)" in select.sql(dialect="postgres")
+
     def test_regular_attribute_uses_raw_value(self):
         source = {
             "system": "nw",